@@ -1,21 +1,35 @@
 #!/usr/bin/env python
 import asyncio
+import collections
 import logging
 import discord
 import configparser
 import os
 import sys
 import datetime
+import functools
+import gzip
 import json
 import signal
 import subprocess
 import socket
+import threading
 import traceback
 import xml.etree.ElementTree as ET
 from urllib.parse import urlparse, parse_qs
+from types import MappingProxyType
 from typing import Any
-from aiohttp import web, ClientSession, TCPConnector
+
+# botocore's ClientError is used for S3
+from aiohttp import (
+    web,
+    ClientError as HTTPClientError,
+    ClientSession,
+    ClientTimeout,
+    TCPConnector,
+)
 from discord.ext import commands, tasks
+from apscheduler.jobstores.memory import MemoryJobStore
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 import twitchio
 from twitchio.web import AiohttpAdapter
@@ -27,15 +41,29 @@ import hashlib
 import secrets
 
 INSTANCE_ID = str(uuid.uuid4())
+UTC = datetime.UTC
 
 # Import boto3 for S3 access
 try:
     import boto3
+    from botocore.config import Config as BotoConfig
     from botocore.exceptions import ClientError
 except ImportError:
     print("❌ Critical: 'boto3' is missing. Please run: pip install boto3")
     sys.exit(1)
 
+# uvloop is optional; fall back to the stdlib event loop when it isn't installed
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# orjson is optional too; stdlib json is used when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Setup & Logging
 logging.basicConfig(
     level=logging.INFO,
@@ -44,17 +72,115 @@ logging.basicConfig(
 )
 logger = logging.getLogger("Bot")
 
+
+# Both work on bytes, so responses and state skip the str decode/encode step
+json_loads = orjson.loads if orjson else json.loads
+
+
+def json_dumps(obj) -> bytes:
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+# Dict that evicts its oldest inserted entries once it grows past maxsize
+class BoundedDict(collections.OrderedDict):
+    def __init__(self, maxsize):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
 # Global Variables
-config = configparser.ConfigParser()
-config.optionxform = str
 twitch_bot = None
-twitch_active_messages = {}
-twitch_active_tasks = {}
-youtube_active_messages = {}
+shutdown_task = None
+DISCORD_EDIT_CONCURRENCY = 4
+# Live messages are normally dropped on their offline event; the cap only stops
+# missed offlines from pinning discord.Message objects forever
+ACTIVE_MESSAGES_MAX = 1024
+twitch_active_messages = BoundedDict(ACTIVE_MESSAGES_MAX)
+twitch_active_logins = {}
+twitch_seen_events = collections.OrderedDict()
+background_tasks = set()
+twitch_stream_cache = {}
+youtube_data_cache = {}
+youtube_inflight = {}
+twitch_thumb_urls = {}
+discord_edit_sem = asyncio.Semaphore(DISCORD_EDIT_CONCURRENCY)
+youtube_active_messages = BoundedDict(ACTIVE_MESSAGES_MAX)
+youtube_uploads_playlists = {}  # Non-UC channels only; persisted in the state file
 STATE_FILE = "state.json"
-scheduler = AsyncIOScheduler()
+STATE_GZIP_MAGIC = b"\x1f\x8b"
+STATE_FLUSH_DELAY = 2  # Seconds to let a burst of state changes settle before uploading
+state_dirty = asyncio.Event()
+last_synced_state_hash = None
+# Flusher, autosave and shutdown each sync from their own to_thread worker; one
+# at a time, so they don't race on state.json.tmp or the last-synced hash
+state_sync_lock = threading.Lock()
+# Pending sniper checks get their own store, so saving state reads exactly those jobs
+YOUTUBE_JOBSTORE = "youtube"
+scheduler = AsyncIOScheduler(
+    jobstores={"default": MemoryJobStore(), YOUTUBE_JOBSTORE: MemoryJobStore()}
+)
 YOUTUBE_WEBHOOK_SECRET = secrets.token_hex(32)
 TWITCH_EVENTSUB_SECRET = secrets.token_hex(32)
+TWITCH_EVENTSUB_SECRET_PINNED = False
+TWITCH_SUB_TYPES = {
+    "stream.online": StreamOnlineSubscription,
+    "stream.offline": StreamOfflineSubscription,
+}
+TWITCH_LIVE_COLOR = 0x9146FF
+YOUTUBE_LIVE_COLOR = 0xFF0000  # Red
+YOUTUBE_MEMBERS_COLOR = 0xFFD700  # Gold
+YOUTUBE_LIVE_COLORS = frozenset((YOUTUBE_LIVE_COLOR, YOUTUBE_MEMBERS_COLOR))
+# Alerts never need to ping anyone; built once and reused for every send
+NOTIFY_MENTIONS = discord.AllowedMentions.none()
+TWITCH_FOOTER_ID_MARKER = "id:"
+# Clark-notation tags for the YouTube Atom feeds, so find() skips the prefix lookup
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+YT_NS = "{http://purl.org/yt/2012}"
+ATOM_ENTRY = f"{ATOM_NS}entry"
+YT_VIDEO_ID = f"{YT_NS}videoId"
+YT_CHANNEL_ID = f"{YT_NS}channelId"
+TWITCH_SUBSCRIBE_CONCURRENCY = 10
+YOUTUBE_BACKFILL_CONCURRENCY = 8
+YOUTUBE_SUBSCRIBE_CONCURRENCY = 8
+YOUTUBE_CHECK_WORKERS = 8
+YOUTUBE_CHECK_QUEUE_MAX = 1000
+YOUTUBE_VIDEOS_URL = "https://www.googleapis.com/youtube/v3/videos"
+YOUTUBE_API_RETRIES = 3
+YOUTUBE_VIDEOS_PER_REQUEST = 50  # videos.list accepts up to 50 ids
+YOUTUBE_BATCH_DELAY = 0.05
+YOUTUBE_QUOTA_BACKOFF = 3600  # Used when a quota 403 doesn't say when to retry
+YOUTUBE_QUOTA_REASONS = frozenset(
+    ("quotaExceeded", "dailyLimitExceeded", "rateLimitExceeded")
+)
+# Sniper timing: start polling shortly before the scheduled start, poll fast just
+# after it, then back off until giving up
+YOUTUBE_SNIPER_LEAD = datetime.timedelta(minutes=3)
+YOUTUBE_FAST_POLL_WINDOW = datetime.timedelta(minutes=3)
+YOUTUBE_FAST_POLL_INTERVAL = datetime.timedelta(seconds=90)
+YOUTUBE_SLOW_POLL_WINDOW = datetime.timedelta(minutes=21)
+YOUTUBE_SLOW_POLL_INTERVAL = datetime.timedelta(minutes=3)
+# Well under the fast poll interval, so the cache only merges bursts
+YOUTUBE_DATA_CACHE_TTL = 20
+# aiohttp's default is a 5 minute total timeout, far longer than a sniper poll interval
+HTTP_TIMEOUT = ClientTimeout(total=15)
+TWITCH_SEEN_EVENTS_MAX = 2048
+TWITCH_SEEN_EVENTS_TTL = 600  # Twitch stops retrying a notification after 10 minutes
+TWITCH_STREAM_CACHE_TTL = 60
+TWITCH_STREAMS_PER_REQUEST = 100  # Helix /streams accepts up to 100 user_ids
+# Helix can lag the online webhook, so a fresh alert missing from /streams isn't over
+TWITCH_OFFLINE_GRACE = datetime.timedelta(minutes=10)
+
+# Non-streamer keys that live alongside the streamer entries in their sections
+TWITCH_CONFIG_KEYS = frozenset(("clientid", "clientsecret", "eventsub_secret"))
+YOUTUBE_CONFIG_KEYS = frozenset(("api_key", "backfill_check"))
 
 # Config Placeholders
 DISCORD_TOKEN = ""
@@ -68,6 +194,7 @@ SERVER_DOMAIN = ""
 PUBLIC_URL = ""
 LOCAL_PORT = 8080
 TWITCH_STREAMERS = {}
+TWITCH_BY_LOGIN = {}
 YOUTUBE_STREAMERS = {}
 INTERNAL_API_SECRET = ""
 
@@ -80,11 +207,9 @@ class DiscordTwitchBot(commands.Bot):
         super().__init__(command_prefix="!", intents=intents)
 
     async def setup_hook(self) -> None:
-        if twitch_bot:
-            self.loop.create_task(twitch_bot.start())
         autosave_state_task.start()
 
-    async def close(self):
+    async def close(self, exit_code=0):
         logger.info("🛑 Received shutdown signal. Saving state...")
         try:
             await asyncio.to_thread(sync_state_to_s3)
@@ -110,9 +235,12 @@ class DiscordTwitchBot(commands.Bot):
         except Exception as e:
             logger.error(f"Error closing Discord bot: {e}")
 
-        logger.info("👋 Exiting successfully (End of close sequence)")
-        # Force immediate success exit, bypassing asyncio's fragile background thread teardown
-        os._exit(0)
+        if exit_code:
+            logger.info(f"👋 Exiting with code {exit_code} (End of close sequence)")
+        else:
+            logger.info("👋 Exiting successfully (End of close sequence)")
+        # Force immediate exit, bypassing asyncio's fragile background thread teardown
+        os._exit(exit_code)
 
 
 # Create the global instance using the new class
@@ -123,7 +251,8 @@ def load_config():
     global DISCORD_TOKEN, DISCORD_CHANNEL_ID, TWITCH_CLIENT_ID, TWITCH_CLIENT_SECRET
     global YOUTUBE_API_KEY, YOUTUBE_BACKFILL_CHECK
     global S3_BUCKET_URL, SERVER_DOMAIN, PUBLIC_URL, LOCAL_PORT
-    global TWITCH_STREAMERS, YOUTUBE_STREAMERS, INTERNAL_API_SECRET
+    global TWITCH_STREAMERS, TWITCH_BY_LOGIN, YOUTUBE_STREAMERS, INTERNAL_API_SECRET
+    global TWITCH_EVENTSUB_SECRET, TWITCH_EVENTSUB_SECRET_PINNED
 
     cred_dir = os.environ.get("CREDENTIALS_DIRECTORY")
     secret_path = None
@@ -163,41 +292,59 @@ def load_config():
     if not files_to_read:
         raise FileNotFoundError("❌ No config files found!")
 
+    # Only needed while loading; every value is copied out into the globals below
+    config = configparser.ConfigParser()
+    config.optionxform = str
     if not config.read(files_to_read):
         raise FileNotFoundError("❌ Failed to parse config files.")
 
-    DISCORD_TOKEN = config["discord"]["token"]
-    DISCORD_CHANNEL_ID = int(config["discord"]["channelid"])
-    TWITCH_CLIENT_ID = config["twitch"]["clientid"]
-    TWITCH_CLIENT_SECRET = config["twitch"]["clientsecret"]
-    YOUTUBE_API_KEY = (
-        config["youtube"].get("api_key", "") if "youtube" in config else ""
-    )
-    YOUTUBE_BACKFILL_CHECK = (
-        int(config["youtube"].get("backfill_check", 2)) if "youtube" in config else 2
-    )
-    S3_BUCKET_URL = config["server"].get(
+    # Resolve every section once and convert values to their final types up front,
+    # so nothing downstream goes back through ConfigParser
+    discord_cfg = config["discord"]
+    twitch_cfg = config["twitch"]
+    server_cfg = config["server"]
+    youtube_cfg = config["youtube"] if "youtube" in config else {}
+
+    DISCORD_TOKEN = discord_cfg["token"]
+    DISCORD_CHANNEL_ID = int(discord_cfg["channelid"])
+    TWITCH_CLIENT_ID = twitch_cfg["clientid"]
+    TWITCH_CLIENT_SECRET = twitch_cfg["clientsecret"]
+    # A configured secret survives restarts, which lets existing webhook
+    # subscriptions be kept instead of recreated on every start
+    if twitch_cfg.get("eventsub_secret"):
+        TWITCH_EVENTSUB_SECRET = twitch_cfg["eventsub_secret"]
+        TWITCH_EVENTSUB_SECRET_PINNED = True
+    YOUTUBE_API_KEY = youtube_cfg.get("api_key", "")
+    YOUTUBE_BACKFILL_CHECK = int(youtube_cfg.get("backfill_check", 2))
+    S3_BUCKET_URL = server_cfg.get(
         "s3_state_url", "s3://phoenix591/discord-twitch/state.json"
     )
-    SERVER_DOMAIN = config["server"]["domain"]
-    PUBLIC_URL = config["server"]["public_url"]
-    LOCAL_PORT = int(config["server"]["port"])
-    INTERNAL_API_SECRET = config["server"]["internal_api_secret"]
+    SERVER_DOMAIN = server_cfg["domain"]
+    PUBLIC_URL = server_cfg["public_url"]
+    LOCAL_PORT = int(server_cfg["port"])
+    INTERNAL_API_SECRET = server_cfg["internal_api_secret"]
 
+    twitch_streamers = {}
     if "streamers" in config:
         logger.warning("⚠️ Legacy [streamers] section found. Moving to Twitch.")
         for s_id, s_name in config["streamers"].items():
-            TWITCH_STREAMERS[str(s_id)] = s_name
-    if "twitch" in config:
-        ignore_keys = ["clientid", "clientsecret", "eventsub_secret"]
-        for s_id, s_name in config["twitch"].items():
-            if s_id.lower() in ignore_keys:
-                continue
-            TWITCH_STREAMERS[str(s_id)] = s_name
-    if "youtube" in config:
-        for c_id, c_name in config["youtube"].items():
-            if c_id not in ["api_key", "backfill_check"]:
-                YOUTUBE_STREAMERS[str(c_id)] = c_name
+            twitch_streamers[str(s_id)] = s_name
+    for s_id, s_name in twitch_cfg.items():
+        if s_id.lower() in TWITCH_CONFIG_KEYS:
+            continue
+        twitch_streamers[str(s_id)] = s_name
+    youtube_streamers = {}
+    for c_id, c_name in youtube_cfg.items():
+        if c_id not in YOUTUBE_CONFIG_KEYS:
+            youtube_streamers[str(c_id)] = c_name
+
+    # The streamer lists are fixed for the life of the process
+    TWITCH_STREAMERS = MappingProxyType(twitch_streamers)
+    YOUTUBE_STREAMERS = MappingProxyType(youtube_streamers)
+    # Reverse index used to map a restored embed's login back to its ID
+    TWITCH_BY_LOGIN = MappingProxyType(
+        {n.lower(): i for i, n in twitch_streamers.items()}
+    )
 
 
 def parse_s3_url(url):
@@ -207,12 +354,23 @@ def parse_s3_url(url):
     return parsed.netloc, parsed.path.lstrip("/")
 
 
+# One client for the life of the process: building it re-reads credentials and
+# endpoint data, and reusing it keeps the HTTPS connection to S3 alive
+@functools.cache
+def get_s3_client():
+    return boto3.client("s3", config=BotoConfig(tcp_keepalive=True))
+
+
+@functools.cache
+def s3_location():
+    return parse_s3_url(S3_BUCKET_URL)
+
+
 def sync_state_from_s3():
     try:
         logger.info("☁️  Downloading state from S3 (via boto3)...")
-        bucket, key = parse_s3_url(S3_BUCKET_URL)
-        s3 = boto3.client("s3")
-        s3.download_file(bucket, key, STATE_FILE)
+        bucket, key = s3_location()
+        get_s3_client().download_file(bucket, key, STATE_FILE)
         logger.info("✅ State downloaded.")
     except ClientError as e:
         if e.response["Error"]["Code"] == "404":
@@ -224,49 +382,66 @@ def sync_state_from_s3():
 
 
 def sync_state_to_s3():
-    try:
-        state_json = save_local_state()
-        bucket, key = parse_s3_url(S3_BUCKET_URL)
-        s3 = boto3.client("s3")
-        s3.put_object(
-            Bucket=bucket,
-            Key=key,
-            Body=state_json.encode("utf-8"),
-            ContentType="application/json",
-        )
-        logger.info("☁️  State synced to S3.")
-    except Exception as e:
-        logger.error(f"❌ S3 Sync failed: {e}")
+    global last_synced_state_hash
+    with state_sync_lock:
+        try:
+            state_gz = save_local_state()
+            state_hash = hashlib.sha256(state_gz).digest()
+            if state_hash == last_synced_state_hash:
+                logger.debug("State unchanged since last S3 sync, skipping upload")
+                return
+            bucket, key = s3_location()
+            get_s3_client().put_object(
+                Bucket=bucket,
+                Key=key,
+                Body=state_gz,
+                ContentType="application/json",
+                ContentEncoding="gzip",
+            )
+            last_synced_state_hash = state_hash
+            logger.info("☁️  State synced to S3.")
+        except Exception as e:
+            logger.error(f"❌ S3 Sync failed: {e}")
 
 
-def save_local_state() -> str:
+def save_local_state() -> bytes:
     jobs = []
-    for job in scheduler.get_jobs():
-        if job.id.startswith("yt_") and not job.id.startswith("yt_monitor_"):
-            try:
-                jobs.append(
-                    {"video_id": job.args[0], "scheduled_time": job.args[1].isoformat()}
-                )
-            except IndexError:
-                pass
-    state_json = json.dumps({"pending_checks": jobs})
-    with open(STATE_FILE, "w") as f:
-        json.dump({"pending_checks": jobs}, f)
-        f.write(state_json)
-    return state_json
+    for job in scheduler.get_jobs(jobstore=YOUTUBE_JOBSTORE):
+        try:
+            jobs.append(
+                {"video_id": job.args[0], "scheduled_time": job.args[1].isoformat()}
+            )
+        except IndexError:
+            pass
+    state_json = json_dumps(
+        {"pending_checks": jobs, "uploads_playlists": dict(youtube_uploads_playlists)}
+    )
+    # mtime=0 keeps the output byte-identical for identical state
+    state_gz = gzip.compress(state_json, compresslevel=6, mtime=0)
+    # Write-then-rename so a crash mid-write never leaves a truncated state file
+    tmp_path = f"{STATE_FILE}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(state_gz)
+    os.replace(tmp_path, STATE_FILE)
+    return state_gz
 
 
 def load_local_state(bot_instance):
     if not os.path.exists(STATE_FILE):
         return
     try:
-        with open(STATE_FILE, "r") as f:
-            data = json.load(f)
-        now = datetime.datetime.now(datetime.timezone.utc)
+        with open(STATE_FILE, "rb") as f:
+            raw = f.read()
+        # State written before compression was added is plain JSON
+        if raw.startswith(STATE_GZIP_MAGIC):
+            raw = gzip.decompress(raw)
+        data = json_loads(raw)
+        youtube_uploads_playlists.update(data.get("uploads_playlists", {}))
+        now = datetime.datetime.now(UTC)
         for item in data.get("pending_checks", []):
             vid = item["video_id"]
             s_time = datetime.datetime.fromisoformat(item["scheduled_time"])
-            run_date = s_time - datetime.timedelta(minutes=3)
+            run_date = s_time - YOUTUBE_SNIPER_LEAD
             if run_date < now:
                 run_date = now + datetime.timedelta(seconds=5)
             scheduler.add_job(
@@ -275,6 +450,7 @@ def load_local_state(bot_instance):
                 run_date=run_date,
                 args=[vid, s_time],
                 id=f"yt_{vid}",
+                jobstore=YOUTUBE_JOBSTORE,
                 replace_existing=True,
             )
         logger.info("♻️  Restored pending YouTube checks.")
@@ -282,6 +458,124 @@ def load_local_state(bot_instance):
         logger.error(f"❌ Failed to load state: {e}")
 
 
+def mark_state_dirty():
+    state_dirty.set()
+
+
+async def state_flusher():
+    # Coalesces bursts (backfill, scheduler churn) into a single upload
+    while True:
+        await state_dirty.wait()
+        await asyncio.sleep(STATE_FLUSH_DELAY)
+        # Cleared before syncing so changes made during the upload trigger another
+        state_dirty.clear()
+        await asyncio.to_thread(sync_state_to_s3)
+
+
+def youtube_uploads_playlist(channel_id):
+    # A channel's uploads playlist is its ID with the UC prefix swapped for UU,
+    # which saves a channels.list call (and its quota) per channel
+    if channel_id.startswith("UC"):
+        return "UU" + channel_id[2:]
+    return youtube_uploads_playlists.get(channel_id)
+
+
+def spawn_background_task(coro, name=None):
+    # The event loop only holds weak references to tasks; keep them alive until done
+    task = asyncio.create_task(coro, name=name)
+    background_tasks.add(task)
+    task.add_done_callback(background_task_done)
+    return task
+
+
+def background_task_done(task):
+    background_tasks.discard(task)
+    if not task.cancelled() and task.exception():
+        logger.error(f"❌ Background task {task.get_name()} failed: {task.exception()}")
+
+
+async def edit_discord_message(msg, **kwargs):
+    # Edits share Discord's per-channel rate limit; keep only a few in flight
+    async with discord_edit_sem:
+        return await msg.edit(**kwargs)
+
+
+def is_duplicate_twitch_event(key) -> bool:
+    if not key:
+        return False
+    now = time.monotonic()
+    # Entries are kept in arrival order, so expired ones are always at the front
+    while twitch_seen_events:
+        oldest_key, seen_at = next(iter(twitch_seen_events.items()))
+        if (
+            now - seen_at < TWITCH_SEEN_EVENTS_TTL
+            and len(twitch_seen_events) < TWITCH_SEEN_EVENTS_MAX
+        ):
+            break
+        twitch_seen_events.popitem(last=False)
+    if key in twitch_seen_events:
+        return True
+    twitch_seen_events[key] = now
+    return False
+
+
+@functools.cache
+def twitch_stream_links(login):
+    # (channel URL, go-live message content); logins are a small fixed set
+    url = f"https://twitch.tv/{login}"
+    return url, f"🔴 **{login}** is LIVE! {url}"
+
+
+def twitch_broadcaster(payload):
+    # twitch_active_messages/tasks are keyed by the string ID everywhere
+    broadcaster = payload.broadcaster
+    return str(broadcaster.id), broadcaster.name
+
+
+def parse_twitch_footer_id(embed):
+    text = embed.footer.text or ""
+    if TWITCH_FOOTER_ID_MARKER not in text:
+        return None
+    return text.rsplit(TWITCH_FOOTER_ID_MARKER, 1)[1].strip() or None
+
+
+def twitch_thumbnail_url(asset):
+    # A streamer's preview template never changes, so format the 720p URL once
+    url = twitch_thumb_urls.get(asset.url)
+    if url is None:
+        url = twitch_thumb_urls[asset.url] = asset.url_for(1280, 720)
+    return url
+
+
+def youtube_thumbnail_url(thumbs):
+    # Best available resolution; `or` stops at the first size YouTube provided
+    return (thumbs.get("maxres") or thumbs.get("high") or thumbs["default"])["url"]
+
+
+def youtube_fetch_done(video_id, task):
+    youtube_inflight.pop(video_id, None)
+    if task.cancelled() or task.exception() or not task.result():
+        return
+    now = time.monotonic()
+    for k in [
+        k for k, v in youtube_data_cache.items() if now - v[0] > YOUTUBE_DATA_CACHE_TTL
+    ]:
+        del youtube_data_cache[k]
+    youtube_data_cache[video_id] = (now, task.result())
+
+
+def youtube_quota_reason(err):
+    # Other 403s (private playlists, disabled keys) say nothing about the quota
+    errors = err.get("error", {}).get("errors") or [{}]
+    reason = errors[0].get("reason")
+    return reason if reason in YOUTUBE_QUOTA_REASONS else None
+
+
+def twitch_message_id(payload):
+    headers = payload.headers
+    return headers.message_id if headers else None
+
+
 # Main Hybrid Bot Class
 class HybridBot(twitchio.Client):
     def __init__(self) -> None:
@@ -292,6 +586,18 @@ class HybridBot(twitchio.Client):
             eventsub_secret=TWITCH_EVENTSUB_SECRET,
         )
         self.session = None
+        self.notify_channel = None
+        self.youtube_quota_until = 0.0
+        # Go-live alerts are posted by a single worker so bursts don't race for Discord's rate limit
+        self.live_queue = asyncio.Queue()
+        self.live_worker = None
+        # WebSub pushes are acknowledged right away and checked by a fixed pool,
+        # so a burst of deliveries can't fan out into unbounded API calls
+        self.youtube_check_queue = asyncio.Queue(maxsize=YOUTUBE_CHECK_QUEUE_MAX)
+        self.youtube_check_workers = []
+        self.youtube_batch = {}
+        self.youtube_batch_flush = None
+        self.state_flusher = None
         super().__init__(
             client_id=TWITCH_CLIENT_ID,
             client_secret=TWITCH_CLIENT_SECRET,
@@ -311,19 +617,56 @@ class HybridBot(twitchio.Client):
 
     async def event_ready(self) -> None:
         logger.info(f"✅ Hybrid Bot Listening on {LOCAL_PORT} (IPv4)")
-        conn = TCPConnector(family=socket.AF_INET)
-        self.session = ClientSession(connector=conn)
+        # twitchio's web adapter starts its AppRunner with handle_signals=True,
+        # which replaces our SIGINT/SIGTERM handlers with aiohttp's GracefulExit
+        install_signal_handlers()
+        # Keep idle connections (and DNS answers) around between the sniper's
+        # polls so repeat requests skip the TCP/TLS handshake. The pool itself is
+        # unbounded: every fan-out (backfill, WebSub renewals, Discord edits) is
+        # already capped by its own semaphore, and the APIs rate-limit server-side
+        conn = TCPConnector(
+            family=socket.AF_INET,
+            limit=0,
+            limit_per_host=0,
+            keepalive_timeout=75,
+            ttl_dns_cache=600,
+        )
+        self.session = ClientSession(connector=conn, timeout=HTTP_TIMEOUT)
 
         await discord_bot.wait_until_ready()
+        if not self.live_worker:
+            self.live_worker = spawn_background_task(
+                self.twitch_live_worker(), name="twitch_live_worker"
+            )
+        if not self.youtube_check_workers:
+            self.youtube_check_workers = [
+                spawn_background_task(
+                    self.youtube_check_worker(), name=f"youtube_check_{i}"
+                )
+                for i in range(YOUTUBE_CHECK_WORKERS)
+            ]
+        if not self.state_flusher:
+            self.state_flusher = spawn_background_task(
+                state_flusher(), name="state_flusher"
+            )
         await self.populate_message_cache()
-        sync_state_from_s3()
+        # The first pass runs right away, catching streams that ended while we were down
+        if not twitch_health_sweep.is_running():
+            twitch_health_sweep.start()
+        await asyncio.to_thread(sync_state_from_s3)
         load_local_state(self)
         scheduler.start()
         await self.setup_twitch_subs()
         await self.run_youtube_backfill()
-        asyncio.create_task(self.maintain_youtube_subs())
+        spawn_background_task(self.maintain_youtube_subs(), name="youtube_subs")
 
     async def close(self):
+        if self.live_worker:
+            self.live_worker.cancel()
+        for worker in self.youtube_check_workers:
+            worker.cancel()
+        if self.state_flusher:
+            self.state_flusher.cancel()
         if self.session:
             await self.session.close()
         await super().close()
@@ -338,7 +681,7 @@ class HybridBot(twitchio.Client):
         # 1. Validate Timestamp to prevent replay attacks (must be within 60 seconds)
         try:
             ts = float(timestamp)
-            now = datetime.datetime.now(datetime.timezone.utc).timestamp()
+            now = time.time()
             if abs(now - ts) > 60:
                 logger.warning(
                     f"⚠️ Takeover attempt rejected: Expired timestamp ({timestamp})"
@@ -364,7 +707,7 @@ class HybridBot(twitchio.Client):
         )
 
         # Schedule the shutdown so we can return the 200 OK response to Ansible immediately
-        asyncio.create_task(self.delayed_shutdown())
+        spawn_background_task(self.delayed_shutdown())
 
         return web.Response(status=200, text="Takeover accepted. Shutting down.")
 
@@ -372,11 +715,10 @@ class HybridBot(twitchio.Client):
         # Wait 1 second to ensure the HTTP 200 OK is sent back to the client
         await asyncio.sleep(1)
 
-        # Trigger your existing clean shutdown logic (Syncs S3 and closes Discord)
-        await discord_bot.close()
-
-        # Exit with code 0 so systemd's 'Restart=on-failure' leaves this dead process in the grave
-        os._exit(0)
+        # Trigger your existing clean shutdown logic (Syncs S3 and closes Discord).
+        # close() exits with code 0 so systemd's 'Restart=on-failure' leaves this
+        # dead process in the grave
+        begin_shutdown()
 
     async def youtube_webhook_handler(self, request):
         if request.method == "GET":
@@ -405,124 +747,168 @@ class HybridBot(twitchio.Client):
 
         # 3. Parse the verified XML
         try:
-            xml_text = body.decode("utf-8")
-            root = ET.fromstring(xml_text)
-            ns = {
-                "atom": "http://www.w3.org/2005/Atom",
-                "yt": "http://purl.org/yt/2012",
-            }
-            entry = root.find("atom:entry", ns)
+            # The C parser reads the encoding from the XML declaration itself
+            root = ET.fromstring(body)
+            entry = root.find(ATOM_ENTRY)
             if entry is not None:
-                vid_elem = entry.find("yt:videoId", ns)
-                cid_elem = entry.find("yt:channelId", ns)
+                vid_elem = entry.find(YT_VIDEO_ID)
+                cid_elem = entry.find(YT_CHANNEL_ID)
                 if vid_elem is not None and cid_elem is not None:
                     video_id = vid_elem.text
                     channel_id = cid_elem.text
                     if channel_id in YOUTUBE_STREAMERS:
-                        asyncio.create_task(self.initial_youtube_check(video_id))
+                        try:
+                            self.youtube_check_queue.put_nowait(video_id)
+                        except asyncio.QueueFull:
+                            logger.warning(
+                                f"⚠️ YouTube check queue full, dropping {video_id}"
+                            )
         except Exception as e:
             logger.error(f"YouTube XML Parse Error: {e}")
 
         return web.Response(text="OK")
 
+    async def youtube_check_worker(self) -> None:
+        while True:
+            video_id = await self.youtube_check_queue.get()
+            try:
+                await self.initial_youtube_check(video_id)
+            except Exception as e:
+                logger.error(f"❌ YouTube check failed for {video_id}: {e}")
+            finally:
+                self.youtube_check_queue.task_done()
+
     async def run_youtube_backfill(self):
         logger.info(f"🔎 Backfilling YouTube State (limit {YOUTUBE_BACKFILL_CHECK})...")
         if not YOUTUBE_API_KEY:
             logger.warning("   ⚠️ No API Key found. Skipping Backfill.")
             return
 
-        tasks = []
         rss_headers = {
             "User-Agent": "Mozilla/5.0 (compatible; DiscordTwitchBot/2.0; +http://discordapp.com)"
         }
 
-        for channel_id in YOUTUBE_STREAMERS:
-            playlist_id = None
+        # Channels are independent, so their lookups overlap instead of queueing
+        sem = asyncio.Semaphore(YOUTUBE_BACKFILL_CONCURRENCY)
+        results = await asyncio.gather(
+            *(
+                self.backfill_youtube_channel(sem, channel_id, rss_headers)
+                for channel_id in YOUTUBE_STREAMERS
+            )
+        )
+        video_ids = [vid for channel_vids in results for vid in channel_vids]
+
+        if video_ids:
+            # One bad video mustn't abort the rest of the backfill (or event_ready)
+            checks = await asyncio.gather(
+                *(self.initial_youtube_check(vid, save=False) for vid in video_ids),
+                return_exceptions=True,
+            )
+            for vid, result in zip(video_ids, checks):
+                if isinstance(result, Exception):
+                    logger.error(f"   ❌ Backfill check failed for {vid}: {result}")
+            mark_state_dirty()
+
+    async def backfill_youtube_channel(self, sem, channel_id, rss_headers):
+        async with sem:
+            return await self.fetch_recent_youtube_videos(channel_id, rss_headers)
+
+    async def lookup_youtube_uploads_playlist(self, channel_id):
+        playlist_id = None
+        try:
+            url = "https://www.googleapis.com/youtube/v3/channels"
+            params = {
+                "part": "contentDetails",
+                "id": channel_id,
+                "key": YOUTUBE_API_KEY,
+            }
+            async with self.session.get(url, params=params) as resp:
+                if resp.status == 200:
+                    data = json_loads(await resp.read())
+                    if data.get("items"):
+                        playlist_id = data["items"][0]["contentDetails"][
+                            "relatedPlaylists"
+                        ]["uploads"]
+                        youtube_uploads_playlists[channel_id] = playlist_id
+                elif resp.status == 403:
+                    err = json_loads(await resp.read())
+                    reason = err.get("error", {}).get("message", "Unknown 403")
+                    logger.warning(f"   ⚠️ API Lookup 403 for {channel_id}: {reason}")
+                    self.pause_youtube_api(resp, err)
+        except Exception as e:
+            logger.debug("   ⚠️ API Lookup exc for %s: %s", channel_id, e)
+        return playlist_id
+
+    def youtube_api_paused(self):
+        return time.monotonic() < self.youtube_quota_until
+
+    def pause_youtube_api(self, resp, err):
+        # Once the quota is gone every other channel would get the same 403,
+        # so the rest of the backfill goes straight to RSS instead
+        reason = youtube_quota_reason(err)
+        if not reason:
+            return
+        try:
+            delay = float(resp.headers.get("Retry-After", YOUTUBE_QUOTA_BACKOFF))
+        except ValueError:
+            delay = YOUTUBE_QUOTA_BACKOFF
+        self.youtube_quota_until = time.monotonic() + delay
+        logger.warning(f"   ⏸️ YouTube API paused for {int(delay)}s ({reason})")
+
+    async def fetch_recent_youtube_videos(self, channel_id, rss_headers):
+        video_ids = []
+        playlist_id = None
+        if not self.youtube_api_paused():
+            playlist_id = youtube_uploads_playlist(channel_id)
+            if not playlist_id:
+                playlist_id = await self.lookup_youtube_uploads_playlist(channel_id)
+
+        success = False
+        if playlist_id and not self.youtube_api_paused():
             try:
-                url = "https://www.googleapis.com/youtube/v3/channels"
+                url = "https://www.googleapis.com/youtube/v3/playlistItems"
                 params = {
                     "part": "contentDetails",
-                    "id": channel_id,
+                    "playlistId": playlist_id,
+                    "maxResults": YOUTUBE_BACKFILL_CHECK,
                     "key": YOUTUBE_API_KEY,
                 }
                 async with self.session.get(url, params=params) as resp:
                     if resp.status == 200:
-                        data = await resp.json()
-                        if data.get("items"):
-                            playlist_id = data["items"][0]["contentDetails"][
-                                "relatedPlaylists"
-                            ]["uploads"]
+                        data = json_loads(await resp.read())
+                        for item in data.get("items", []):
+                            video_ids.append(item["contentDetails"]["videoId"])
+                        success = True
                     elif resp.status == 403:
-                        err = await resp.json()
+                        err = json_loads(await resp.read())
                         reason = err.get("error", {}).get("message", "Unknown 403")
                         logger.warning(
-                            f"   ⚠️ API Lookup 403 for {channel_id}: {reason}"
+                            f"   ⚠️ Playlist Fetch 403 for {channel_id}: {reason}"
                         )
+                        self.pause_youtube_api(resp, err)
             except Exception as e:
-                logger.debug(f"   ⚠️ API Lookup exc for {channel_id}: {e}")
+                logger.debug("   ⚠️ Playlist Fetch exc: %s", e)
 
-            if not playlist_id and channel_id.startswith("UC"):
-                playlist_id = "UU" + channel_id[2:]
-
-            success = False
-            if playlist_id:
-                try:
-                    url = "https://www.googleapis.com/youtube/v3/playlistItems"
-                    params = {
-                        "part": "contentDetails",
-                        "playlistId": playlist_id,
-                        "maxResults": YOUTUBE_BACKFILL_CHECK,
-                        "key": YOUTUBE_API_KEY,
-                    }
-                    async with self.session.get(url, params=params) as resp:
-                        if resp.status == 200:
-                            data = await resp.json()
-                            for item in data.get("items", []):
-                                vid = item["contentDetails"]["videoId"]
-                                tasks.append(
-                                    self.initial_youtube_check(vid, save=False)
-                                )
-                            success = True
-                        elif resp.status == 403:
-                            err = await resp.json()
-                            reason = err.get("error", {}).get("message", "Unknown 403")
-                            logger.warning(
-                                f"   ⚠️ Playlist Fetch 403 for {channel_id}: {reason}"
-                            )
-                except Exception as e:
-                    logger.debug(f"   ⚠️ Playlist Fetch exc: {e}")
-
-            if not success:
-                try:
-                    url = f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
-                    async with self.session.get(url, headers=rss_headers) as resp:
-                        if resp.status == 200:
-                            xml_text = await resp.text()
-                            root = ET.fromstring(xml_text)
-                            ns = {
-                                "atom": "http://www.w3.org/2005/Atom",
-                                "yt": "http://purl.org/yt/2012",
-                            }
-                            for entry in root.findall("atom:entry", ns)[
-                                :YOUTUBE_BACKFILL_CHECK
-                            ]:
-                                vid_elem = entry.find("yt:videoId", ns)
-                                if vid_elem is not None and vid_elem.text:
-                                    tasks.append(
-                                        self.initial_youtube_check(
-                                            vid_elem.text, save=False
-                                        )
-                                    )
-                        else:
-                            logger.warning(
-                                f"   ❌ RSS Fallback failed for {channel_id}: {resp.status}"
-                            )
-                except Exception as e:
-                    logger.warning(f"   ❌ RSS Fallback exc for {channel_id}: {e}")
+        if not success:
+            try:
+                url = (
+                    f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
+                )
+                async with self.session.get(url, headers=rss_headers) as resp:
+                    if resp.status == 200:
+                        root = ET.fromstring(await resp.read())
+                        for entry in root.findall(ATOM_ENTRY)[:YOUTUBE_BACKFILL_CHECK]:
+                            vid_elem = entry.find(YT_VIDEO_ID)
+                            if vid_elem is not None and vid_elem.text:
+                                video_ids.append(vid_elem.text)
+                    else:
+                        logger.warning(
+                            f"   ❌ RSS Fallback failed for {channel_id}: {resp.status}"
+                        )
+            except Exception as e:
+                logger.warning(f"   ❌ RSS Fallback exc for {channel_id}: {e}")
 
-        if tasks:
-            await asyncio.gather(*tasks)
-            await asyncio.to_thread(sync_state_to_s3)
+        return video_ids
 
     async def initial_youtube_check(self, video_id, save=True):
         data = await self.fetch_youtube_data(video_id)
@@ -539,8 +925,8 @@ class HybridBot(twitchio.Client):
         elif scheduled_start:
             dt = datetime.datetime.fromisoformat(scheduled_start.replace("Z", "+00:00"))
             logger.info(f"   🗓️ Scheduled for {dt}. Queueing Sniper.")
-            run_time = dt - datetime.timedelta(minutes=3)
-            now = datetime.datetime.now(datetime.timezone.utc)
+            run_time = dt - YOUTUBE_SNIPER_LEAD
+            now = datetime.datetime.now(UTC)
             if run_time < now:
                 run_time = now + datetime.timedelta(seconds=10)
             scheduler.add_job(
@@ -549,44 +935,47 @@ class HybridBot(twitchio.Client):
                 run_date=run_time,
                 args=[video_id, dt],
                 id=f"yt_{video_id}",
+                jobstore=YOUTUBE_JOBSTORE,
                 replace_existing=True,
             )
             if save:
-                await asyncio.to_thread(sync_state_to_s3)
+                mark_state_dirty()
 
     async def check_youtube_status(self, video_id, scheduled_time):
         data = await self.fetch_youtube_data(video_id)
         if not data:
             return
         is_live = data["snippet"].get("liveBroadcastContent") == "live"
-        now = datetime.datetime.now(datetime.timezone.utc)
+        now = datetime.datetime.now(UTC)
 
         if is_live:
             logger.info(f"🎯 Sniper Hit! {video_id} is LIVE.")
             await self.send_youtube_notification(data)
             return
 
-        if now < (scheduled_time + datetime.timedelta(minutes=3)):
-            next_run = now + datetime.timedelta(seconds=90)
+        if now < (scheduled_time + YOUTUBE_FAST_POLL_WINDOW):
+            next_run = now + YOUTUBE_FAST_POLL_INTERVAL
             scheduler.add_job(
                 self.check_youtube_status,
                 "date",
                 run_date=next_run,
                 args=[video_id, scheduled_time],
                 id=f"yt_{video_id}",
+                jobstore=YOUTUBE_JOBSTORE,
             )
-        elif now < (scheduled_time + datetime.timedelta(minutes=21)):
-            next_run = now + datetime.timedelta(minutes=3)
+        elif now < (scheduled_time + YOUTUBE_SLOW_POLL_WINDOW):
+            next_run = now + YOUTUBE_SLOW_POLL_INTERVAL
             scheduler.add_job(
                 self.check_youtube_status,
                 "date",
                 run_date=next_run,
                 args=[video_id, scheduled_time],
                 id=f"yt_{video_id}",
+                jobstore=YOUTUBE_JOBSTORE,
             )
         else:
             logger.info(f"   🛑 Giving up on {video_id} (Never went live).")
-            await asyncio.to_thread(sync_state_to_s3)
+            mark_state_dirty()
 
     async def check_youtube_offline(self, video_id):
         if video_id not in youtube_active_messages:
@@ -603,24 +992,26 @@ class HybridBot(twitchio.Client):
         if is_live:
             return
 
+        # Popped up front so an overlapping check can't edit the same message twice
+        msg = youtube_active_messages.pop(video_id, None)
+        if msg is None:
+            self.remove_youtube_monitor(video_id)
+            return
         try:
-            msg = youtube_active_messages[video_id]
             old_embed = msg.embeds[0]
             new_embed = discord.Embed(
                 title=old_embed.title,
                 url=old_embed.url,
                 description="**Stream Ended**",
                 color=0x2C2F33,
-                timestamp=datetime.datetime.now(datetime.timezone.utc),
+                timestamp=datetime.datetime.now(UTC),
             )
             if old_embed.image:
                 new_embed.set_image(url=old_embed.image.url)
-            await msg.edit(content=None, embed=new_embed)
+            await edit_discord_message(msg, content=None, embed=new_embed)
         except Exception as e:
             logger.error(f"Failed to edit offline message for {video_id}: {e}")
 
-        if video_id in youtube_active_messages:
-            del youtube_active_messages[video_id]
         self.remove_youtube_monitor(video_id)
 
     def remove_youtube_monitor(self, video_id):
@@ -629,21 +1020,88 @@ class HybridBot(twitchio.Client):
             scheduler.remove_job(job_id)
 
     async def fetch_youtube_data(self, video_id):
+        cached = youtube_data_cache.get(video_id)
+        if cached and time.monotonic() - cached[0] < YOUTUBE_DATA_CACHE_TTL:
+            return cached[1]
+        # Checks for the same video that overlap (WebSub retransmits, a push racing
+        # a scheduled job) share one request instead of each calling the API
+        task = youtube_inflight.get(video_id)
+        if task is None:
+            task = asyncio.create_task(self.request_youtube_data(video_id))
+            youtube_inflight[video_id] = task
+            task.add_done_callback(functools.partial(youtube_fetch_done, video_id))
+        # Shielded so one cancelled caller doesn't cancel the request for the others
+        return await asyncio.shield(task)
+
+    async def request_youtube_data(self, video_id):
         if not YOUTUBE_API_KEY:
             return None
         if not self.session:
             return None
-        url = "https://www.googleapis.com/youtube/v3/videos"
+        # Lookups arriving within YOUTUBE_BATCH_DELAY of each other (backfill,
+        # coinciding schedules) go out as one videos.list call
+        fut = asyncio.get_running_loop().create_future()
+        self.youtube_batch[video_id] = fut
+        if self.youtube_batch_flush is None:
+            self.youtube_batch_flush = spawn_background_task(
+                self.flush_youtube_batch(), name="youtube_batch"
+            )
+        return await fut
+
+    async def flush_youtube_batch(self):
+        await asyncio.sleep(YOUTUBE_BATCH_DELAY)
+        # Anything requested from here on starts the next batch
+        batch, self.youtube_batch = self.youtube_batch, {}
+        self.youtube_batch_flush = None
+        ids = list(batch)
+        await asyncio.gather(
+            *(
+                self.resolve_youtube_batch(
+                    {vid: batch[vid] for vid in ids[i : i + YOUTUBE_VIDEOS_PER_REQUEST]}
+                )
+                for i in range(0, len(ids), YOUTUBE_VIDEOS_PER_REQUEST)
+            )
+        )
+
+    async def resolve_youtube_batch(self, futures):
+        try:
+            items = await self.request_youtube_videos(list(futures))
+        except Exception as e:
+            for fut in futures.values():
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for vid, fut in futures.items():
+            if not fut.done():
+                fut.set_result(items.get(vid))
+
+    async def request_youtube_videos(self, video_ids):
         params = {
             "part": "snippet,liveStreamingDetails,statistics",
-            "id": video_id,
+            "id": ",".join(video_ids),
             "key": YOUTUBE_API_KEY,
         }
-        async with self.session.get(url, params=params) as resp:
-            if resp.status != 200:
-                return None
-            js = await resp.json()
-            return js["items"][0] if js["items"] else None
+        # A lost sniper poll isn't rescheduled, so ride out brief network/5xx blips
+        for attempt in range(YOUTUBE_API_RETRIES):
+            if attempt:
+                await asyncio.sleep(2**attempt)
+            last_attempt = attempt == YOUTUBE_API_RETRIES - 1
+            try:
+                async with self.session.get(YOUTUBE_VIDEOS_URL, params=params) as resp:
+                    if resp.status >= 500:
+                        if not last_attempt:
+                            continue
+                        # Raise rather than return {}: an outage must not read
+                        # as "video gone" and end every live alert in the batch
+                        resp.raise_for_status()
+                    if resp.status != 200:
+                        return {}
+                    js = json_loads(await resp.read())
+                    return {item["id"]: item for item in js.get("items", [])}
+            except (HTTPClientError, asyncio.TimeoutError) as e:
+                if last_attempt:
+                    raise
+                logger.debug("   ⚠️ YouTube fetch retry for %s: %s", params["id"], e)
 
     async def send_youtube_notification(self, data):
         vid_id = data["id"]
@@ -664,29 +1122,27 @@ class HybridBot(twitchio.Client):
         if is_members_only:
             title_prefix = "( MEMBERS ONLY )"
             desc = f"🔒 **{channel_name}** is live for **MEMBERS ONLY**!"
-            color = 0xFFD700  # Gold
+            color = YOUTUBE_MEMBERS_COLOR
         else:
             title_prefix = "🔴"
             desc = f"**{channel_name}** is LIVE on YouTube!"
-            color = 0xFF0000  # Red
+            color = YOUTUBE_LIVE_COLOR
 
         embed = discord.Embed(
             title=f"{title_prefix} {data['snippet']['title']}",
             url=url,
             description=desc,
             color=color,
-            timestamp=datetime.datetime.now(datetime.timezone.utc),
+            timestamp=datetime.datetime.now(UTC),
         )
-        thumbs = data["snippet"]["thumbnails"]
-        thumb_url = thumbs.get("maxres", thumbs.get("high", thumbs.get("default")))[
-            "url"
-        ]
-        embed.set_image(url=thumb_url)
+        embed.set_image(url=youtube_thumbnail_url(data["snippet"]["thumbnails"]))
 
-        chan = discord_bot.get_channel(DISCORD_CHANNEL_ID)
+        chan = self.get_notify_channel()
         if chan:
             msg = await chan.send(
-                content=f"{title_prefix} **{channel_name}** is LIVE! {url}", embed=embed
+                content=f"{title_prefix} **{channel_name}** is LIVE! {url}",
+                embed=embed,
+                allowed_mentions=NOTIFY_MENTIONS,
             )
             youtube_active_messages[vid_id] = msg
             scheduler.add_job(
@@ -700,221 +1156,380 @@ class HybridBot(twitchio.Client):
 
     def remove_youtube_job(self, video_id, save=True):
         job_id = f"yt_{video_id}"
-        if scheduler.get_job(job_id):
-            scheduler.remove_job(job_id)
+        if scheduler.get_job(job_id, jobstore=YOUTUBE_JOBSTORE):
+            scheduler.remove_job(job_id, jobstore=YOUTUBE_JOBSTORE)
             if save:
-                sync_state_to_s3()
+                mark_state_dirty()
 
     async def maintain_youtube_subs(self):
         await discord_bot.wait_until_ready()
         hub_url = "https://pubsubhubbub.appspot.com/subscribe"
+        # The lease request for each channel never changes, so build them once
+        hub_callback = f"{PUBLIC_URL}/youtube"
+        payloads = {
+            cid: {
+                "hub.mode": "subscribe",
+                "hub.topic": f"https://www.youtube.com/xml/feeds/videos.xml?channel_id={cid}",
+                "hub.callback": hub_callback,
+                "hub.lease_seconds": 432000,
+                "hub.secret": YOUTUBE_WEBHOOK_SECRET,
+            }
+            for cid in YOUTUBE_STREAMERS
+        }
         while not discord_bot.is_closed():
             logger.info("📡 Renewing YouTube WebSub Leases...")
-            for cid in YOUTUBE_STREAMERS:
-                data = {
-                    "hub.mode": "subscribe",
-                    "hub.topic": f"https://www.youtube.com/xml/feeds/videos.xml?channel_id={cid}",
-                    "hub.callback": f"{PUBLIC_URL}/youtube",
-                    "hub.lease_seconds": 432000,
-                    "hub.secret": YOUTUBE_WEBHOOK_SECRET,
-                }
-                for attempt in range(4):
-                    try:
-                        if self.session:
-                            async with self.session.post(hub_url, data=data) as resp:
-                                if resp.status >= 400:
-                                    logger.error(
-                                        f"   ❌ Failed sub for {cid} (HTTP {resp.status}) - Attempt {attempt + 1}/4"
-                                    )
-                                    if attempt < 3:
-                                        # Sleep for 15 seconds before retrying
-                                        await asyncio.sleep(15)
-                                else:
-                                    logger.info(
-                                        f"   ➜ Subscribed to YouTube: {YOUTUBE_STREAMERS[cid]} ({cid})"
-                                    )
-                                    break  # Success, break out of the retry loop
-                    except Exception as e:
-                        logger.error(
-                            f"   ❌ Failed sub for {cid} ({e}) - Attempt {attempt + 1}/4"
-                        )
-                        if attempt < 3:
-                            await asyncio.sleep(15)
+            sem = asyncio.Semaphore(YOUTUBE_SUBSCRIBE_CONCURRENCY)
+            await asyncio.gather(
+                *(
+                    self.renew_youtube_sub(sem, hub_url, cid, data)
+                    for cid, data in payloads.items()
+                )
+            )
             await asyncio.sleep(345600)
 
+    async def renew_youtube_sub(self, sem, hub_url, cid, data):
+        for attempt in range(4):
+            try:
+                async with sem, self.session.post(hub_url, data=data) as resp:
+                    if resp.status < 400:
+                        logger.info(
+                            f"   ➜ Subscribed to YouTube: {YOUTUBE_STREAMERS[cid]} ({cid})"
+                        )
+                        return
+                    logger.error(
+                        f"   ❌ Failed sub for {cid} (HTTP {resp.status}) - Attempt {attempt + 1}/4"
+                    )
+            except Exception as e:
+                logger.error(
+                    f"   ❌ Failed sub for {cid} ({e}) - Attempt {attempt + 1}/4"
+                )
+            if attempt < 3:
+                # Back off outside the semaphore so other channels keep renewing
+                await asyncio.sleep(15)
+
     # Twitch Logic
     async def setup_twitch_subs(self):
-        try:
-            await self.delete_all_eventsub_subscriptions()
-        except:
-            pass
-        logger.info(f"📋 Subscribing {len(TWITCH_STREAMERS)} Twitch channels...")
-        for s_id, s_name in TWITCH_STREAMERS.items():
+        wanted = {(s_id, t) for s_id in TWITCH_STREAMERS for t in TWITCH_SUB_TYPES}
+        have = set()
+        stale = []
+        if TWITCH_EVENTSUB_SECRET_PINNED:
+            # Subscriptions are signed with the secret they were created with, so
+            # they can only be reused when that secret is the configured one
             try:
-                await self.subscribe_webhook(
-                    payload=StreamOnlineSubscription(
-                        broadcaster_user_id=s_id, version="1"
-                    ),
-                    callback_url=PUBLIC_URL,
+                subs = await self.fetch_eventsub_subscriptions()
+                async for sub in subs.subscriptions:
+                    key = (str(sub.condition.get("broadcaster_user_id")), sub.type)
+                    usable = (
+                        sub.transport.method == "webhook"
+                        and sub.transport.callback == PUBLIC_URL
+                        and sub.status
+                        in ("enabled", "webhook_callback_verification_pending")
+                    )
+                    if usable and key in wanted and key not in have:
+                        have.add(key)
+                    else:
+                        stale.append(sub.id)
+            except Exception as e:
+                logger.warning(f"⚠️ Could not list Twitch subscriptions: {e}")
+                have.clear()
+                stale = None
+        else:
+            stale = None
+
+        # Bound the fan-out so a large streamer list doesn't trip Helix rate limits
+        sem = asyncio.Semaphore(TWITCH_SUBSCRIBE_CONCURRENCY)
+        if stale is None:
+            try:
+                await self.delete_all_eventsub_subscriptions()
+            except:
+                pass
+        elif stale:
+            logger.info(f"🧹 Removing {len(stale)} stale Twitch subscriptions...")
+            await asyncio.gather(
+                *(self.delete_twitch_sub(sem, sub_id) for sub_id in stale),
+                return_exceptions=True,
+            )
+
+        missing = sorted(wanted - have)
+        logger.info(
+            f"📋 Subscribing {len(TWITCH_STREAMERS)} Twitch channels "
+            f"({len(missing)} subscriptions to create, {len(have)} kept)..."
+        )
+        results = await asyncio.gather(
+            *(self.subscribe_twitch_event(sem, s_id, t) for s_id, t in missing),
+            return_exceptions=True,
+        )
+        if missing:
+            ok = sum(1 for r in results if r is True)
+            logger.info("   ➜ Created %d/%d Twitch subscriptions", ok, len(missing))
+
+    async def delete_twitch_sub(self, sem, sub_id):
+        async with sem:
+            try:
+                await self.delete_eventsub_subscription(sub_id)
+            except Exception as e:
+                logger.error(
+                    f"   ❌ Failed to delete Twitch subscription {sub_id}: {e}"
                 )
+
+    async def subscribe_twitch_event(self, sem, s_id, sub_type):
+        s_name = TWITCH_STREAMERS[s_id]
+        async with sem:
+            try:
                 await self.subscribe_webhook(
-                    payload=StreamOfflineSubscription(
+                    payload=TWITCH_SUB_TYPES[sub_type](
                         broadcaster_user_id=s_id, version="1"
                     ),
                     callback_url=PUBLIC_URL,
                 )
-                logger.info(f"   ➜ Subscribed to Twitch: {s_name}")
+                # One line per subscription is noise at INFO; the summary covers it
+                logger.debug("   ➜ Subscribed to Twitch: %s (%s)", s_name, sub_type)
+                return True
             except Exception as e:
-                logger.error(f"   ❌ Failed Twitch {s_name}: {e}")
+                logger.error(f"   ❌ Failed Twitch {s_name} ({sub_type}): {e}")
+                return False
+
+    async def event_subscription_revoked(self, payload) -> None:
+        # Twitch pushes revocations, so report them as they happen instead of polling
+        s_id = str(payload.raw.get("condition", {}).get("broadcaster_user_id", ""))
+        s_name = TWITCH_STREAMERS.get(s_id, s_id or "unknown")
+        logger.warning(
+            f"⚠️ Twitch revoked {payload.type} for {s_name}: {payload.status.value}"
+        )
+
+    def get_notify_channel(self):
+        # Every alert goes to the one configured channel, so resolve it once
+        if self.notify_channel is None:
+            self.notify_channel = discord_bot.get_channel(DISCORD_CHANNEL_ID)
+        return self.notify_channel
 
     async def populate_message_cache(self) -> None:
-        channel = discord_bot.get_channel(DISCORD_CHANNEL_ID)
+        channel = self.get_notify_channel()
         if not isinstance(channel, discord.TextChannel):
             return
         try:
+            # The page arrives in a single REST call, but Message objects are built
+            # lazily as we iterate, so stopping early skips the rest of them
+            bot_user = discord_bot.user
             async for message in channel.history(limit=50):
-                if message.author != discord_bot.user or not message.embeds:
+                # Without YouTube channels there is nothing older left to restore
+                # once every tracked Twitch streamer has its message back
+                if not YOUTUBE_STREAMERS and len(twitch_active_messages) >= len(
+                    TWITCH_STREAMERS
+                ):
+                    break
+                if message.author != bot_user or not message.embeds:
                     continue
                 embed = message.embeds[0]
-                if embed.color:
-                    # Twitch Logic
-                    if embed.color.value == 9520895:
-                        url = embed.url
-                        if url:
-                            login = url.split("/")[-1].lower()
-                            found_id = next(
-                                (
-                                    i
-                                    for i, n in TWITCH_STREAMERS.items()
-                                    if n.lower() == login
-                                ),
-                                None,
-                            )
-                            if found_id:
-                                if found_id not in twitch_active_messages:
-                                    twitch_active_messages[found_id] = message
-                                    twitch_active_tasks[found_id] = asyncio.create_task(
-                                        self.delayed_check(found_id, login)
-                                    )
-
-                    # YouTube Logic (Red or Gold)
-                    elif embed.color.value in [16711680, 16766720]:
-                        if embed.url:
-                            try:
-                                parsed = urlparse(embed.url)
-                                if "youtube.com" in parsed.netloc:
-                                    qs = parse_qs(parsed.query)
-                                    vid_id = qs.get("v", [None])[0]
-                                    if vid_id:
-                                        youtube_active_messages[vid_id] = message
-                                        scheduler.add_job(
-                                            self.check_youtube_offline,
-                                            "interval",
-                                            minutes=30,
-                                            args=[vid_id],
-                                            id=f"yt_monitor_{vid_id}",
-                                            replace_existing=True,
-                                        )
-                            except:
-                                pass
+                color_val = getattr(embed.color, "value", None)
+                # Twitch Logic
+                if color_val == TWITCH_LIVE_COLOR:
+                    found_id = parse_twitch_footer_id(embed)
+                    url = embed.url
+                    login = url.rsplit("/", 1)[-1].lower() if url else None
+                    # Messages posted before the footer marker existed: map the URL login
+                    if not found_id and login:
+                        found_id = TWITCH_BY_LOGIN.get(login)
+                    if (
+                        found_id in TWITCH_STREAMERS
+                        and found_id not in twitch_active_messages
+                    ):
+                        login = login or TWITCH_STREAMERS[found_id]
+                        twitch_active_messages[found_id] = message
+                        twitch_active_logins[found_id] = login
+
+                # YouTube Logic (Red or Gold)
+                elif color_val in YOUTUBE_LIVE_COLORS:
+                    if embed.url:
+                        parsed = urlparse(embed.url)
+                        if "youtube.com" in parsed.netloc:
+                            qs = parse_qs(parsed.query)
+                            vid_id = qs.get("v", [None])[0]
+                            if vid_id:
+                                youtube_active_messages[vid_id] = message
+                                scheduler.add_job(
+                                    self.check_youtube_offline,
+                                    "interval",
+                                    minutes=30,
+                                    args=[vid_id],
+                                    id=f"yt_monitor_{vid_id}",
+                                    replace_existing=True,
+                                )
 
         except Exception as e:
             logger.error(f"❌ Cache rebuild fail: {e}")
 
     async def event_stream_online(self, payload: twitchio.StreamOnline) -> None:
-        s_id = str(payload.broadcaster.id)
-        s_login = payload.broadcaster.name
+        s_id, s_login = twitch_broadcaster(payload)
+        # Key on the broadcast ID: it's shared by Twitch retries and by the same
+        # go-live delivered through overlapping subscriptions during a takeover
+        if is_duplicate_twitch_event(f"online:{payload.id}"):
+            logger.info(f"   ℹ️ Ignoring redelivered online event for {s_login}")
+            return
         if s_id in twitch_active_messages:
             logger.info(f"   ℹ️ Ignoring duplicate online event for {s_login}")
             return
         logger.info(f"📣 Twitch LIVE: {s_login}")
-        stream_data = None
-
-        for attempt in range(3):
+        try:
+            stream_data = await self.fetch_stream_cached(s_id, payload.id)
+        except Exception:
+            stream_data = None
+
+        # Post straight away; if Helix hasn't caught up yet, the embed is filled in later
+        embed = self.build_twitch_embed(s_id, s_login, stream_data)
+        retry_id = payload.id if stream_data is None else None
+        self.live_queue.put_nowait((s_id, s_login, embed, retry_id))
+
+    async def retry_fetch_and_edit(self, msg, s_id, s_login, stream_id) -> None:
+        for attempt in range(2):
+            logger.info(
+                f"   ⏳ Stream data unavailable, retrying in 5s... ({attempt+1}/2)"
+            )
+            await asyncio.sleep(5)
             try:
-                streams = [s async for s in self.fetch_streams(user_ids=[s_id])]
-                if streams:
-                    stream_data = streams[0]
-                    break
+                stream_data = await self.fetch_stream_cached(s_id, stream_id)
             except Exception:
-                pass
+                continue
+            if not stream_data:
+                continue
+            # Skip the edit if the stream already ended or was re-posted meanwhile
+            if twitch_active_messages.get(s_id) is msg:
+                try:
+                    await edit_discord_message(
+                        msg, embed=self.build_twitch_embed(s_id, s_login, stream_data)
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to update Twitch alert for {s_login}: {e}")
+            return
 
-            if attempt < 2:
-                logger.info(
-                    f"   ⏳ Stream data unavailable, retrying in 5s... ({attempt+1}/3)"
-                )
-                await asyncio.sleep(5)
+    async def fetch_stream_cached(self, s_id, stream_id=None):
+        now = time.monotonic()
+        cached = twitch_stream_cache.get(s_id)
+        # A go-live passes its broadcast ID: a fresh entry for an earlier
+        # broadcast (a quick restart) would carry its old title and thumbnail
+        if (
+            cached
+            and now - cached[0] < TWITCH_STREAM_CACHE_TTL
+            and (stream_id is None or cached[1].id == stream_id)
+        ):
+            return cached[1]
+
+        # Only the first (and only) stream matters, so don't drain the iterator
+        stream = await anext(self.fetch_streams(user_ids=[s_id], first=1), None)
+        if stream is None or (stream_id and stream.id != stream_id):
+            # Don't cache a miss: Helix often lags a fresh go-live by a few seconds
+            return None
+        # Opportunistically drop stale entries so the cache stays small
+        for k in [k for k, v in twitch_stream_cache.items() if now - v[0] > 300]:
+            del twitch_stream_cache[k]
+        twitch_stream_cache[s_id] = (now, stream)
+        return stream
+
+    async def twitch_live_worker(self) -> None:
+        while True:
+            s_id, s_login, embed, retry_id = await self.live_queue.get()
+            try:
+                msg = await self.send_twitch_notification(s_id, s_login, embed)
+                # retry_id is the broadcast ID when Helix had no data for it yet
+                if msg and retry_id:
+                    spawn_background_task(
+                        self.retry_fetch_and_edit(msg, s_id, s_login, retry_id)
+                    )
+            except Exception as e:
+                logger.error(f"❌ Failed to send Twitch alert for {s_login}: {e}")
+            finally:
+                self.live_queue.task_done()
 
-        embed = self.build_twitch_embed(s_login, stream_data)
-        chan = discord_bot.get_channel(DISCORD_CHANNEL_ID)
+    async def send_twitch_notification(self, s_id, s_login, embed):
+        # Another event may have been posted while this one sat in the queue
+        if s_id in twitch_active_messages:
+            logger.info(f"   ℹ️ Ignoring duplicate online event for {s_login}")
+            return None
+        chan = self.get_notify_channel()
         if chan:
             msg = await chan.send(
-                content=f"🔴 **{s_login}** is LIVE! https://twitch.tv/{s_login}",
+                content=twitch_stream_links(s_login)[1],
                 embed=embed,
+                allowed_mentions=NOTIFY_MENTIONS,
             )
             twitch_active_messages[s_id] = msg
-            if s_id in twitch_active_tasks:
-                twitch_active_tasks[s_id].cancel()
-            twitch_active_tasks[s_id] = asyncio.create_task(
-                self.delayed_check(s_id, s_login)
-            )
+            twitch_active_logins[s_id] = s_login
+            return msg
+        return None
 
     async def event_stream_offline(self, payload: twitchio.StreamOffline) -> None:
-        s_id = str(payload.broadcaster.id)
-        if s_id in twitch_active_messages:
-            try:
-                ts = int(datetime.datetime.now().timestamp())
-                embed = discord.Embed(
-                    title=f"⚫ {payload.broadcaster.name} ended.",
-                    description=f"Ended at <t:{ts}:T>.",
-                    color=0x2C2F33,
-                )
-                await twitch_active_messages[s_id].edit(content=None, embed=embed)
-            except:
-                pass
-            del twitch_active_messages[s_id]
-            if s_id in twitch_active_tasks:
-                twitch_active_tasks[s_id].cancel()
-                del twitch_active_tasks[s_id]
-
-    async def delayed_check(self, s_id: str, s_login: str) -> None:
-        try:  # <-- Move this to the very top!
-            await asyncio.sleep(3600)
-            if s_id not in twitch_active_messages:
-                return
+        s_id, s_login = twitch_broadcaster(payload)
+        if is_duplicate_twitch_event(twitch_message_id(payload)):
+            return
+        await self.mark_twitch_offline(s_id, s_login)
 
-            streams = [s async for s in self.fetch_streams(user_ids=[s_id])]
-            if not streams:
-                ts = int(datetime.datetime.now().timestamp())
-                embed = discord.Embed(
-                    title=f"⚫ {s_login} ended.",
-                    description=f"Ended at <t:{ts}:T>.",
-                    color=0x2C2F33,
-                )
-                await twitch_active_messages[s_id].edit(content=None, embed=embed)
-                del twitch_active_messages[s_id]
+    async def mark_twitch_offline(self, s_id, s_login) -> None:
+        msg = twitch_active_messages.pop(s_id, None)
+        twitch_active_logins.pop(s_id, None)
+        if msg is None:
+            return
+        try:
+            await edit_discord_message(
+                msg, content=None, embed=self.build_twitch_offline_embed(s_login)
+            )
+        except Exception as e:
+            logger.error(f"Failed to mark Twitch alert for {s_login} as ended: {e}")
 
-                if s_id in twitch_active_tasks:
-                    del twitch_active_tasks[s_id]
-            else:
-                await twitch_active_messages[s_id].edit(
-                    embed=self.build_twitch_embed(s_login, streams[0])
-                )
-                twitch_active_tasks[s_id] = asyncio.create_task(
-                    self.delayed_check(s_id, s_login)
+    async def check_active_twitch_streams(self) -> None:
+        s_ids = list(twitch_active_messages)
+        if not s_ids:
+            return
+
+        # One Helix call per 100 live streamers instead of one per streamer
+        live = {}
+        for i in range(0, len(s_ids), TWITCH_STREAMS_PER_REQUEST):
+            batch = s_ids[i : i + TWITCH_STREAMS_PER_REQUEST]
+            async for stream in self.fetch_streams(
+                user_ids=batch, first=TWITCH_STREAMS_PER_REQUEST
+            ):
+                live[str(stream.user.id)] = stream
+
+        # Take a slot before creating each task so at most DISCORD_EDIT_CONCURRENCY
+        # refreshes are pending at once; the rest wait here instead of piling up
+        slots = asyncio.Semaphore(DISCORD_EDIT_CONCURRENCY)
+        pending = []
+        for s_id in s_ids:
+            msg = twitch_active_messages.get(s_id)
+            if msg is None:
+                continue
+            await slots.acquire()
+            task = asyncio.create_task(
+                self.refresh_twitch_alert(s_id, msg, live.get(s_id))
+            )
+            task.add_done_callback(lambda _: slots.release())
+            pending.append(task)
+        await asyncio.gather(*pending)
+
+    async def refresh_twitch_alert(self, s_id, msg, stream) -> None:
+        s_login = twitch_active_logins.get(s_id) or TWITCH_STREAMERS.get(s_id, s_id)
+        try:
+            if stream:
+                await edit_discord_message(
+                    msg, embed=self.build_twitch_embed(s_id, s_login, stream)
                 )
+                return
 
-        except asyncio.CancelledError:
-            # Task was canceled cleanly; do nothing
-            pass
+            if datetime.datetime.now(UTC) - msg.created_at < TWITCH_OFFLINE_GRACE:
+                return
+            # Silent offline: the offline webhook never arrived
+            await self.mark_twitch_offline(s_id, s_login)
         except Exception as e:
-            logger.error(f"Error in delayed check for {s_login}: {e}")
-            # Try again in an hour if there was a temporary network error
-            twitch_active_tasks[s_id] = asyncio.create_task(
-                self.delayed_check(s_id, s_login)
-            )
+            logger.error(f"Error in hourly check for {s_login}: {e}")
+
+    def build_twitch_offline_embed(self, login):
+        ts = int(time.time())
+        return discord.Embed(
+            title=f"⚫ {login} ended.",
+            description=f"Ended at <t:{ts}:T>.",
+            color=0x2C2F33,
+        )
 
-    def build_twitch_embed(self, login, data):
+    def build_twitch_embed(self, s_id, login, data):
         if data:
             title = data.title if data.title else "Live Stream"
             game = data.game_name if data.game_name else "Unknown"
@@ -925,28 +1540,31 @@ class HybridBot(twitchio.Client):
             else:
                 desc = f"**{login}** playing **{game}**"
 
-            ts = datetime.datetime.now(datetime.timezone.utc)
+            ts = datetime.datetime.now(UTC)
 
             # Append a cache-busting parameter (?t=...) so Discord fetches the new frame
             if data.thumbnail:
-                thumb_url = f"{data.thumbnail.url_for(1280, 720)}?t={int(time.time())}"
+                thumb_url = (
+                    f"{twitch_thumbnail_url(data.thumbnail)}?t={int(time.time())}"
+                )
             else:
                 thumb_url = None
         else:
             title = "Live Stream"
             desc = f"**{login}** is LIVE!"
-            ts = datetime.datetime.now(datetime.timezone.utc)
+            ts = datetime.datetime.now(UTC)
             thumb_url = None
 
         embed = discord.Embed(
             title=title,
-            url=f"https://twitch.tv/{login}",
+            url=twitch_stream_links(login)[0],
             description=desc,
-            color=0x9146FF,
+            color=TWITCH_LIVE_COLOR,
             timestamp=ts,
         )
 
-        embed.set_footer(text="Last Updated")
+        # The ID marker lets populate_message_cache restore the message after a restart
+        embed.set_footer(text=f"Last Updated • {TWITCH_FOOTER_ID_MARKER}{s_id}")
 
         if thumb_url:
             embed.set_image(url=thumb_url)
@@ -959,12 +1577,68 @@ async def autosave_state_task():
     await asyncio.to_thread(sync_state_to_s3)
 
 
+@tasks.loop(hours=1)
+async def twitch_health_sweep():
+    if not twitch_bot:
+        return
+    try:
+        await twitch_bot.check_active_twitch_streams()
+    except Exception as e:
+        # Most likely a temporary network error; try again next hour
+        logger.error(f"Error in hourly Twitch check: {e}")
+
+
+def begin_shutdown():
+    global shutdown_task
+    # Signals and the takeover API share one close(); any later request while
+    # the first shutdown is still saving state is ignored
+    if shutdown_task:
+        return False
+    shutdown_task = spawn_background_task(discord_bot.close(), name="shutdown")
+    return True
+
+
+def request_shutdown(sig):
+    if begin_shutdown():
+        logger.info(f"🛑 Caught {sig.name}")
+
+
+def install_signal_handlers() -> None:
+    # systemd stops the unit with SIGTERM; send it (and Ctrl-C) through
+    # discord_bot.close() so state is saved and both clients shut down cleanly
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, request_shutdown, sig)
+        except NotImplementedError:
+            pass  # Windows event loops don't support signal handlers
+
+
+async def run_bots() -> None:
+    # Covers startup; event_ready installs them again once the webhook server is up
+    install_signal_handlers()
+    # Run both clients as siblings so a crash in either one cancels the other
+    # instead of dying silently in a detached task
+    async with discord_bot:
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(discord_bot.start(DISCORD_TOKEN), name="discord_bot")
+                if twitch_bot:
+                    tg.create_task(twitch_bot.start(), name="twitch_bot")
+        except Exception as e:
+            # Leaving "async with" would call close() and exit 0, hiding the
+            # crash from the log and from systemd's Restart=on-failure
+            logger.critical(f"🔥 FATAL ERROR: {e!r}")
+            traceback.print_exc()
+            await discord_bot.close(exit_code=1)
+
+
 def main() -> None:
     global twitch_bot
     try:
         load_config()
         twitch_bot = HybridBot()
-        discord_bot.run(DISCORD_TOKEN)
+        asyncio.run(run_bots(), loop_factory=uvloop.new_event_loop if uvloop else None)
     except KeyboardInterrupt:
         pass
     except Exception as e: